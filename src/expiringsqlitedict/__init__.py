@@ -2,11 +2,14 @@
 
 import json
 import sqlite3
+import time
+import zlib
 from sqlite3 import sqlite_version_info
 from contextlib import ExitStack, closing, contextmanager
 from datetime import timedelta
+from functools import partial
 from types import TracebackType
-from typing import Any, Generator, ItemsView, Iterator, KeysView, Optional, Reversible, Tuple, Type, Union, MutableMapping, ValuesView
+from typing import Any, Callable, Dict, Generator, Iterable, ItemsView, Iterator, KeysView, List, Mapping, Optional, Reversible, Tuple, Type, Union, MutableMapping, ValuesView
 from weakref import finalize
 from enum import unique, Enum
 
@@ -15,10 +18,19 @@ class Identifier:
     '''
     __slots__ = (
         '__value',
+        '__escaped',
     )
 
     def __init__(self, value: str) -> None:
         self.__value = value
+        self.__escaped = self.__escape(value)
+
+    @staticmethod
+    def __escape(value: str) -> str:
+        if b'\x00' in value.encode('utf-8'):
+            raise ValueError("sqlite Identifer must not contain any null bytes")
+
+        return '"' + value.replace('"', '""') + '"'
 
     @property
     def value(self) -> str:
@@ -38,6 +50,7 @@ class Identifier:
         if isinstance(other, Identifier):
             other = other.__value
         self.__value += other
+        self.__escaped = self.__escape(self.__value)
         return self
 
     def __contains__(self, other: Union['Identifier', str]) -> bool:
@@ -52,10 +65,7 @@ class Identifier:
         return f'<Identifier {self}>'
 
     def __str__(self) -> str:
-        if b'\x00' in self.__value.encode('utf-8'):
-            raise ValueError("sqlite Identifer must not contain any null bytes")
-
-        return '"' + self.__value.replace('"', '""') + '"'
+        return self.__escaped
 
 @unique
 class Order(str, Enum):
@@ -72,28 +82,124 @@ class Order(str, Enum):
     def __format__(self, format_spec: str) -> str:
         return self.value.__format__(format_spec)
 
+_json_dumps_compact = partial(
+    json.dumps,
+    separators=(',', ':'),
+    ensure_ascii=False,
+)
+
+def _json_dumps(value: Any) -> bytes:
+    '''Serialize to compact UTF-8 encoded JSON.
+
+    Pre-encoding to bytes stores the value as a BLOB, so reads hand the
+    buffer straight back to json.loads without SQLite text transcoding.
+    '''
+
+    return _json_dumps_compact(value).encode('utf-8')
+
+class CompressedSerializer:
+    '''A serializer wrapper that compresses serialized values.
+
+    This wraps any other serializer, compressing its output with zlib
+    when that actually shrinks it.  A one-byte prefix marks whether the
+    stored payload is raw or compressed.  Payloads smaller than
+    ``min_size`` are always stored raw, skipping the compression work
+    that would almost certainly be wasted on them.
+
+    A zlib preset dictionary may be given as ``zdict``, which helps the
+    ratio on many small, similarly-shaped values; the same dictionary
+    must be used to read the values back.
+    '''
+
+    __slots__ = (
+        '_serializer',
+        '_level',
+        '_zdict',
+        '_min_size',
+    )
+
+    _RAW = b'R'
+    _COMPRESSED = b'Z'
+
+    def __init__(
+        self,
+        serializer: Any = json,
+        level: int = -1,
+        zdict: bytes = b'',
+        min_size: int = 64,
+    ) -> None:
+        self._serializer = serializer
+        self._level = level
+        self._zdict = zdict
+        self._min_size = min_size
+
+    def dumps(self, value: Any) -> bytes:
+        data = self._serializer.dumps(value)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if len(data) >= self._min_size:
+            if self._zdict:
+                compressor = zlib.compressobj(self._level, zdict=self._zdict)
+                compressed = compressor.compress(data) + compressor.flush()
+            else:
+                # One C call and one allocation, rather than a
+                # compressobj plus two partial buffers and a join.
+                compressed = zlib.compress(data, self._level)
+            if len(compressed) < len(data):
+                return self._COMPRESSED + compressed
+        return self._RAW + data
+
+    def loads(self, data: bytes) -> Any:
+        # Compare the prefix as an integer and decompress through a
+        # memoryview, so dispatch allocates no intermediate bytes.
+        prefix = data[0]
+        if prefix == self._COMPRESSED[0]:
+            payload = zlib.decompressobj(zdict=self._zdict).decompress(
+                memoryview(data)[1:],
+            )
+        elif prefix == self._RAW[0]:
+            payload = data[1:]
+        else:
+            raise ValueError(f'unknown serialized prefix {bytes((prefix,))!r}')
+        return self._serializer.loads(payload)
+
+def _tune(connection: sqlite3.Connection, synchronous: str = 'NORMAL') -> None:
+    '''Apply the standard performance pragmas to a fresh connection.
+
+    WAL avoids the rollback-journal double fsync and allows readers to
+    overlap the writer, NORMAL synchronous is durable enough under WAL,
+    and the busy timeout keeps concurrent openers from failing fast.
+    '''
+    assert synchronous == 'OFF' or synchronous == 'NORMAL' or synchronous == 'FULL' or synchronous == 'EXTRA'
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA synchronous={synchronous}')
+        cursor.execute('PRAGMA busy_timeout=5000')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-65536')
+        cursor.execute('PRAGMA mmap_size=268435456')
+
 @contextmanager
 def _transaction(
     connection: sqlite3.Connection,
     begin: str,
 ) -> Generator[None, None, None]:
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(begin)
+    connection.execute(begin)
     try:
         yield
     except:
-        with closing(connection.cursor()) as cursor:
-            cursor.execute('ROLLBACK')
+        connection.execute('ROLLBACK')
         raise
     else:
-        with closing(connection.cursor()) as cursor:
-            cursor.execute('COMMIT')
+        connection.execute('COMMIT')
 
 class _Keys(Reversible, KeysView[str]):
     __slots__ = (
         '_connection',
         '_table',
-        '_order',
+        '_asc_sql',
+        '_desc_sql',
     )
 
     def __init__(
@@ -105,14 +211,20 @@ class _Keys(Reversible, KeysView[str]):
 
         self._connection = connection
         self._table = table
-        self._order = order
-    
-    def _iterator(self, order: str) -> Iterator[str]:
+        select = f'SELECT key FROM {table} ORDER BY {order}'
+        self._asc_sql = select + ' ASC'
+        self._desc_sql = select + ' DESC'
+
+    def _iterator(self, sql: str) -> Iterator[str]:
         with closing(self._connection.cursor()) as cursor:
-            for row in cursor.execute(
-                f'SELECT key FROM {self._table} ORDER BY {self._order} {order}',
-            ):
-                yield row[0]
+            cursor.arraysize = 1024
+            cursor.execute(sql)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield row[0]
 
     def __contains__(self, obj: object) -> bool:
         if isinstance(obj, str):
@@ -132,17 +244,19 @@ class _Keys(Reversible, KeysView[str]):
         assert False
 
     def __iter__(self) -> Iterator[str]:
-        return self._iterator('ASC')
+        return self._iterator(self._asc_sql)
 
     def __reversed__(self) -> Iterator[str]:
-        return self._iterator('DESC')
+        return self._iterator(self._desc_sql)
 
 class _Values(Reversible, ValuesView[Any]):
     __slots__ = (
         '_connection',
         '_table',
         '_serializer',
-        '_order',
+        '_dumps',
+        '_asc_sql',
+        '_desc_sql',
     )
 
     def __init__(
@@ -150,28 +264,46 @@ class _Values(Reversible, ValuesView[Any]):
         connection: sqlite3.Connection,
         table: Union[str, Identifier],
         serializer: Any,
+        dumps: Callable[[Any], Any],
         order: Order,
     ) -> None:
 
         self._connection = connection
         self._table = table
         self._serializer = serializer
-        self._order = order
+        self._dumps = dumps
+        select = f'SELECT value FROM {table} ORDER BY {order}'
+        self._asc_sql = select + ' ASC'
+        self._desc_sql = select + ' DESC'
 
-    def _iterator(self, order: str) -> Iterator[Any]:
+    def _iterator(self, sql: str) -> Iterator[Any]:
+        loads = self._serializer.loads
         with closing(self._connection.cursor()) as cursor:
-            for row in cursor.execute(
-                f'SELECT value FROM {self._table} ORDER BY {self._order} {order}',
-            ):
-                yield self._serializer.loads(row[0])
+            cursor.arraysize = 1024
+            cursor.execute(sql)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield loads(row[0])
 
     def __contains__(self, obj: object) -> bool:
-        try:
-            serialized = self._serializer.dumps(obj)
-        except Exception:
-            return False
-        if isinstance(obj, str):
-            with closing(self._connection.cursor()) as cursor:
+        # The probe must be serialized exactly as the write path stores
+        # it, and databases written by older versions may hold TEXT rows
+        # straight from the serializer, which never compare equal to
+        # BLOB, so try both encodings.
+        candidates: List[Any] = []
+        for dumps in (self._dumps, self._serializer.dumps):
+            try:
+                serialized = dumps(obj)
+            except Exception:
+                continue
+            if serialized not in candidates:
+                candidates.append(serialized)
+
+        with closing(self._connection.cursor()) as cursor:
+            for serialized in candidates:
                 for row in cursor.execute(
                     f'SELECT 1 FROM {self._table} WHERE value = ?',
                     (serialized,),
@@ -185,17 +317,19 @@ class _Values(Reversible, ValuesView[Any]):
             return cursor.execute(f'SELECT COUNT(*) FROM {self._table}').fetchone()[0]
 
     def __iter__(self) -> Iterator[Any]:
-        return self._iterator('ASC')
+        return self._iterator(self._asc_sql)
 
     def __reversed__(self) -> Iterator[Any]:
-        return self._iterator('DESC')
+        return self._iterator(self._desc_sql)
 
 class _Items(Reversible, ItemsView[str, Any]):
     __slots__ = (
         '_connection',
         '_table',
         '_serializer',
-        '_order',
+        '_dumps',
+        '_asc_sql',
+        '_desc_sql',
     )
 
     def __init__(
@@ -203,20 +337,31 @@ class _Items(Reversible, ItemsView[str, Any]):
         connection: sqlite3.Connection,
         table: Union[str, Identifier],
         serializer: Any,
+        dumps: Callable[[Any], Any],
         order: Order,
     ) -> None:
         self._connection = connection
         self._table = table
         self._serializer = serializer
-        self._order = order
-    
-    def _iterator(self, order: str) -> Iterator[Tuple[str, Any]]:
+        self._dumps = dumps
+        select = f'''
+            SELECT key, value FROM {table}
+                ORDER BY {order}
+        '''
+        self._asc_sql = select + ' ASC'
+        self._desc_sql = select + ' DESC'
+
+    def _iterator(self, sql: str) -> Iterator[Tuple[str, Any]]:
+        loads = self._serializer.loads
         with closing(self._connection.cursor()) as cursor:
-            for row in cursor.execute(f'''
-                SELECT key, value FROM {self._table}
-                    ORDER BY {self._order} {order}
-            '''):
-                yield row[0], self._serializer.loads(row[1])
+            cursor.arraysize = 1024
+            cursor.execute(sql)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield row[0], loads(row[1])
 
     def __len__(self) -> int:
         with closing(self._connection.cursor()) as cursor:
@@ -227,25 +372,38 @@ class _Items(Reversible, ItemsView[str, Any]):
         value: Any
         try:
             key, value = obj # type: ignore
-            if not isinstance(key, str):
-                return False
-            serialized = self._serializer.dumps(value)
         except Exception:
             return False
+        if not isinstance(key, str):
+            return False
 
-        if isinstance(obj, str):
-            with closing(self._connection.cursor()) as cursor:
+        # As in _Values.__contains__, probe with the write path's
+        # serialization as well as the raw serializer's, so TEXT rows
+        # from older databases still match.
+        candidates: List[Any] = []
+        for dumps in (self._dumps, self._serializer.dumps):
+            try:
+                serialized = dumps(value)
+            except Exception:
+                continue
+            if serialized not in candidates:
+                candidates.append(serialized)
+
+        with closing(self._connection.cursor()) as cursor:
+            for serialized in candidates:
                 for row in cursor.execute(
                     f'SELECT 1 FROM {self._table} WHERE key = ? AND value = ?',
                     (key, serialized),
                 ):
                     return True
+
         return False
+
     def __iter__(self) -> Iterator[Tuple[str, Any]]:
-        return self._iterator('ASC')
+        return self._iterator(self._asc_sql)
 
     def __reversed__(self) -> Iterator[Tuple[str, Any]]:
-        return self._iterator('DESC')
+        return self._iterator(self._desc_sql)
 
 
 class ConnectionManager:
@@ -264,6 +422,7 @@ class ConnectionManager:
         '_lifespan',
         '_transaction',
         '_table',
+        '_synchronous',
     )
 
     def __init__(self,
@@ -272,6 +431,7 @@ class ConnectionManager:
         lifespan: timedelta = timedelta(weeks=1),
         transaction: str = 'IMMEDIATE',
         table: Union[str, Identifier] = Identifier('expiringsqlitedict'),
+        synchronous: str = 'NORMAL',
         **kwargs,
     ) -> None:
         if isinstance(table, str):
@@ -283,6 +443,7 @@ class ConnectionManager:
         self._lifespan = lifespan
         self._transaction = transaction
         self._table = table
+        self._synchronous = synchronous
 
     @property
     def lifespan(self) -> timedelta:
@@ -302,15 +463,17 @@ class ConnectionManager:
         assert not hasattr(self, '_exit_stack'), 'Can not be entered more than once at a time'
 
         with ExitStack() as exit_stack:
+            kwargs = dict(self._kwargs)
+            # A deeper statement cache than the default 128 keeps all of
+            # our fixed statements plus the caller's hot ones resident.
+            kwargs.setdefault('cached_statements', 256)
             connection = exit_stack.enter_context(closing(sqlite3.connect(
                 *self._args,
                 isolation_level=None,
-                **self._kwargs,
+                **kwargs,
             )))
 
-            with closing(connection.cursor()) as cursor:
-                cursor.execute('PRAGMA journal_mode=WAL')
-                cursor.execute('PRAGMA synchronous=NORMAL')
+            _tune(connection, self._synchronous)
 
             def optimize() -> None:
                 with closing(connection.cursor()) as cursor:
@@ -358,6 +521,7 @@ class TransactionManager:
         '_lifespan',
         '_begin',
         '_table',
+        '_cached_connection',
     )
 
     def __init__(self,
@@ -375,6 +539,7 @@ class TransactionManager:
         self._lifespan = lifespan
         self._begin = f'BEGIN {transaction} TRANSACTION'
         self._table = table
+        self._cached_connection: Optional['Connection'] = None
 
     @property
     def lifespan(self) -> timedelta:
@@ -396,12 +561,20 @@ class TransactionManager:
         with ExitStack() as exit_stack:
             exit_stack.enter_context(_transaction(self._connection, self._begin))
 
-            connection = Connection(
-                self._connection,
-                serializer=self._serializer,
-                lifespan=self._lifespan,
-                table=self._table,
-            )
+            # The schema check and statement setup only need to happen
+            # once per SQLite connection, not once per transaction.
+            connection = self._cached_connection
+            if connection is None:
+                connection = Connection(
+                    self._connection,
+                    serializer=self._serializer,
+                    lifespan=self._lifespan,
+                    table=self._table,
+                )
+            else:
+                connection.lifespan = self._lifespan
+            connection._sweep()
+            self._cached_connection = connection
             self._exit_stack = exit_stack.pop_all()
             return connection
 
@@ -417,6 +590,11 @@ class TransactionManager:
             return self._exit_stack.__exit__(type, value, traceback)
         finally:
             del self._exit_stack
+            if type is not None:
+                # The rollback may have undone schema setup or a
+                # migration that ran inside this transaction, so the
+                # next entry must rebuild the Connection from scratch.
+                self._cached_connection = None
 
 class Manager:
     """
@@ -437,6 +615,7 @@ class Manager:
         lifespan: timedelta = timedelta(weeks=1),
         transaction: str = 'IMMEDIATE',
         table: Union[str, Identifier] = Identifier('expiringsqlitedict'),
+        synchronous: str = 'NORMAL',
         **kwargs,
     ) -> None:
         self._connection_manager = ConnectionManager(
@@ -445,6 +624,7 @@ class Manager:
             lifespan=lifespan,
             transaction=transaction,
             table=table,
+            synchronous=synchronous,
             **kwargs
         )
 
@@ -490,6 +670,7 @@ def Simple(
     lifespan: timedelta = timedelta(weeks=1),
     isolation_level: Optional[str] = None,
     table: Union[str, Identifier] = Identifier('expiringsqlitedict'),
+    synchronous: str = 'NORMAL',
     **kwargs,
 ) -> 'Connection':
     """
@@ -501,10 +682,9 @@ def Simple(
 
     # Needed until we drop Python 3.6 and 3.7 support so we have access to Literal.  This will happen in July.
     assert isolation_level is None or isolation_level == 'DEFERRED' or isolation_level == 'EXCLUSIVE' or isolation_level == 'IMMEDIATE'
+    kwargs.setdefault('cached_statements', 256)
     db = sqlite3.connect(*args, isolation_level=isolation_level, **kwargs)
-    with closing(db.cursor()) as cursor:
-        cursor.execute('PRAGMA journal_mode=WAL')
-        cursor.execute('PRAGMA synchronous=NORMAL')
+    _tune(db, synchronous)
 
     if isinstance(table, str):
         table = Identifier(table)
@@ -515,6 +695,7 @@ def Simple(
         lifespan=lifespan,
         table=table,
     )
+    connection._sweep()
 
     def _close():
         '''Optimize and close the database.
@@ -537,25 +718,29 @@ else:
 
 _trailer = ', '.join(_trailers)
 
-if sqlite_version_info >= (3, 38):
-    _unixepoch = 'UNIXEPOCH()'
-else:
-    _unixepoch = "CAST(strftime('%s', 'now') AS INTEGER)"
-
 APPLICATION_ID = 1820903862
 
 class Connection(MutableMapping[str, Any]):
     '''The actual connection object.
 
-    Items are expired when a value is inserted or updated.  Deletion or
-    postponement does not expire items.
+    Expired items are swept out when a transaction is entered, rather
+    than on every insert or update.  Deletion or postponement does not
+    expire items.
     '''
 
     __slots__ = (
         '_lifespan',
         '_serializer',
+        '_dumps',
+        '_loads',
         '_connection',
+        '_cursor',
         '_table',
+        '_get_sql',
+        '_set_sql',
+        '_contains_sql',
+        '_del_sql',
+        '_sweep_sql',
         '__weakref__',
     )
 
@@ -570,6 +755,15 @@ class Connection(MutableMapping[str, Any]):
 
         self._lifespan = lifespan.total_seconds()
         self._serializer = serializer
+        # Bind once so the hot methods skip two attribute lookups per call.
+        if serializer is json:
+            # The stdlib defaults emit spaces after separators and
+            # escape all non-ASCII; the compact byte form stores fewer
+            # bytes and loads back identically.
+            self._dumps = _json_dumps
+        else:
+            self._dumps = serializer.dumps
+        self._loads = serializer.loads
         self._connection = connection
         self._table = table
 
@@ -607,41 +801,21 @@ class Connection(MutableMapping[str, Any]):
                         RENAME TO {self._table + "_v0"}
                     ''')
 
-                # Use autoincrement to make this sort like a standard python
-                # dictionary, with new keys always coming last.
+                # The integer primary key makes this sort like a standard
+                # python dictionary, with new keys always coming last.
+                # AUTOINCREMENT is unnecessary for that: without it SQLite
+                # can only ever hand out max(id) + 1 or reuse the largest
+                # deleted id, either of which still sorts after every
+                # surviving row, and each insert skips the
+                # sqlite_sequence bookkeeping write.
                 cursor.execute(f'''
                     CREATE TABLE {self._table} (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                        id INTEGER PRIMARY KEY NOT NULL,
                         key TEXT UNIQUE NOT NULL,
                         expire INTEGER NOT NULL,
                         value {_valuetype} NOT NULL){_trailer}
                 ''')
 
-                cursor.execute(f'''
-                    CREATE INDEX {self._table + "_expire_index"}
-                     ON {self._table} (expire)
-                ''')
-
-                cursor.execute(
-                    f'''
-                    CREATE TRIGGER {self._table + "_insert_trigger"}
-                        AFTER INSERT ON {self._table}
-                    BEGIN
-                        DELETE FROM {self._table} WHERE expire <= {_unixepoch};
-                    END
-                    '''
-                )
-
-                cursor.execute(
-                    f'''
-                    CREATE TRIGGER {self._table + "_update_trigger"}
-                        AFTER UPDATE OF value ON {self._table}
-                    BEGIN
-                        DELETE FROM {self._table} WHERE expire <= {_unixepoch};
-                    END
-                    '''
-                )
-
                 if migrate:
                     cursor.execute(f'''
                         INSERT INTO {self._table}
@@ -651,15 +825,69 @@ class Connection(MutableMapping[str, Any]):
                     ''')
                     cursor.execute(f'DROP TABLE {self._table + "_v0"}')
 
-                cursor.execute('PRAGMA user_version = 1')
+                cursor.execute('PRAGMA user_version = 2')
 
-                user_version = 1
+                user_version = 2
 
-            if user_version > 1:
+            if user_version == 1:
+                # Version 1 swept expired rows from per-row triggers;
+                # the sweep now runs once per transaction instead.
+                cursor.execute(f'''
+                    DROP TRIGGER IF EXISTS {self._table + "_insert_trigger"}
+                ''')
+                cursor.execute(f'''
+                    DROP TRIGGER IF EXISTS {self._table + "_update_trigger"}
+                ''')
+                cursor.execute('PRAGMA user_version = 2')
+
+                user_version = 2
+
+            if user_version == 2:
+                # A covering index lets the sweep and the
+                # expire-ordered key iteration run entirely off the
+                # index, instead of an expire range scan that
+                # dereferences the table row by row.  Databases
+                # migrated from version 1 still carry a plain (expire)
+                # index under the same name, so drop it first rather
+                # than relying on CREATE INDEX IF NOT EXISTS, which
+                # would silently keep it.
+                cursor.execute(f'''
+                    DROP INDEX IF EXISTS {self._table + "_expire_index"}
+                ''')
+                cursor.execute(f'''
+                    CREATE INDEX {self._table + "_expire_index"}
+                        ON {self._table} (expire, key)
+                ''')
+                cursor.execute('PRAGMA user_version = 3')
+
+                user_version = 3
+
+            if user_version > 3:
                 raise ValueError(
                     'this version of expiringsqlitedict is not'
                     ' compatible with this schema version'
                 )
+
+        # Build the hot-path statements once, so every call executes an
+        # identical string and hits sqlite3's statement cache, and keep one
+        # long-lived cursor rather than allocating one per operation.
+        self._get_sql = f'SELECT value FROM {self._table} WHERE key = ?'
+        self._contains_sql = (
+            f'SELECT EXISTS(SELECT 1 FROM {self._table} WHERE key = ?)'
+        )
+        self._del_sql = f'DELETE FROM {self._table} WHERE key=?'
+        self._sweep_sql = f'DELETE FROM {self._table} WHERE expire <= ?'
+        if sqlite_version_info >= (3, 24):
+            self._set_sql = f'''
+                INSERT INTO {self._table} (key, expire, value)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (key) DO UPDATE
+                    SET value=excluded.value, expire=excluded.expire
+            '''
+        else:
+            self._set_sql = ''
+        self._cursor = connection.cursor()
+
     @property
     def connection(self) -> sqlite3.Connection:
         return self._connection
@@ -678,14 +906,29 @@ class Connection(MutableMapping[str, Any]):
     def lifespan(self, value: timedelta) -> None:
         self._lifespan = value.total_seconds()
 
+    def _expire(self) -> int:
+        '''Calculate the expiration timestamp for an item touched now.
+
+        This is computed in Python so the hot statements bind a plain
+        integer, instead of making SQLite format and reparse a time
+        string per row.
+        '''
+
+        return int(time.time() + self._lifespan)
+
+    def _sweep(self) -> None:
+        '''Delete all expired items.
+        '''
+
+        self._cursor.execute(self._sweep_sql, (int(time.time()),))
+
     def __len__(self) -> int:
         '''Get the count of keys in the table.
         '''
 
-        with closing(self._connection.cursor()) as cursor:
-            for row in cursor.execute(f'SELECT COUNT(*) FROM {self._table}'):
-                return row[0]
-        return 0
+        return self._connection.execute(
+            f'SELECT COUNT(*) FROM {self._table}',
+        ).fetchone()[0]
 
     def __bool__(self) -> bool:
         '''Check if the table is not empty.'''
@@ -716,6 +959,7 @@ class Connection(MutableMapping[str, Any]):
             connection=self._connection,
             table=self._table,
             serializer=self._serializer,
+            dumps=self._dumps,
             order=order,
         )
 
@@ -727,6 +971,7 @@ class Connection(MutableMapping[str, Any]):
             connection=self._connection,
             table=self._table,
             serializer=self._serializer,
+            dumps=self._dumps,
             order=order,
         )
 
@@ -737,88 +982,145 @@ class Connection(MutableMapping[str, Any]):
         if not isinstance(key, str):
             return False
 
-        with closing(self._connection.cursor()) as cursor:
-            for _ in cursor.execute(
-                f'SELECT 1 FROM {self._table} WHERE key = ?',
-                (key,),
-            ):
-                return True
-        return False
+        return bool(self._cursor.execute(self._contains_sql, (key,)).fetchone()[0])
 
     def __getitem__(self, key: str) -> Any:
         '''Fetch the key.
         '''
 
-        with closing(self._connection.cursor()) as cursor:
-            for row in cursor.execute(
-                f'SELECT value FROM {self._table} WHERE key = ?', (key,)
-            ):
-                return self._serializer.loads(row[0])
+        for row in self._cursor.execute(self._get_sql, (key,)):
+            return self._loads(row[0])
         raise KeyError(key)
 
+    def get(self, key: str, default: Any = None) -> Any:
+        '''Fetch the key, or the default if it is not present.
+
+        Defined directly rather than through the MutableMapping mixin,
+        which would raise and swallow a KeyError on every miss.
+        '''
+
+        for row in self._cursor.execute(self._get_sql, (key,)):
+            return self._loads(row[0])
+        return default
+
     def __setitem__(self, key: str, value: Any) -> None:
         '''Set or replace the item.
+        '''
 
-        This also triggers cleaning up expired values.
+        expire = self._expire()
+        if self._set_sql:
+            self._cursor.execute(
+                self._set_sql,
+                (key, expire, self._dumps(value)),
+            )
+        elif key in self:
+            self._cursor.execute(f'''
+                    UPDATE {self._table}
+                        SET expire=?,
+                            value=?
+                        WHERE key=?
+                ''',
+                (expire, self._dumps(value), key),
+            )
+        else:
+            self._cursor.execute(f'''
+                    INSERT INTO {self._table} (key, expire, value)
+                        VALUES (?, ?, ?)
+                ''',
+                (key, expire, self._dumps(value)),
+            )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        '''Fetch many keys in one statement.
+
+        Returns a dict of the keys that were present; missing keys are
+        simply absent rather than raising.  Large batches are chunked to
+        stay under SQLite's bound-parameter limit.
         '''
 
+        loads = self._loads
+        keys = list(keys)
+        result: Dict[str, Any] = {}
         with closing(self._connection.cursor()) as cursor:
-            if sqlite_version_info >= (3, 24):
-                cursor.execute(f'''
-                        INSERT INTO {self._table} (key, expire, value)
-                            VALUES (?, {_unixepoch} + ?, ?)
-                            ON CONFLICT (key) DO UPDATE
-                            SET value=excluded.value, expire=excluded.expire
-                    ''',
-                    (key, self._lifespan, self._serializer.dumps(value)),
-                )
-            elif key in self:
-                cursor.execute(f'''
-                        UPDATE {self._table}
-                            SET expire={_unixepoch} + ?,
-                                value=?
-                            WHERE key=?
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for key, value in cursor.execute(
+                    f'''
+                        SELECT key, value FROM {self._table}
+                            WHERE key IN ({placeholders})
                     ''',
-                    (self._lifespan, self._serializer.dumps(value), key),
-                )
+                    chunk,
+                ):
+                    result[key] = loads(value)
+        return result
+
+    def update(*args: Any, **kwargs: Any) -> None:
+        '''Set or replace many items at once.
+
+        All pairs go through a single executemany, so the statement is
+        prepared once and each item costs only a bind and a step instead
+        of a full Python __setitem__ round trip.
+
+        The positional argument is pulled out of *args, the same way
+        MutableMapping.update does it, so that a keyword argument named
+        "other" stays an ordinary key.
+        '''
+
+        self, *args = args
+        if len(args) > 1:
+            raise TypeError(
+                f'update expected at most 1 argument, got {len(args)}'
+            )
+        other: Union[Mapping[str, Any], Iterable[Tuple[str, Any]]] = (
+            args[0] if args else ()
+        )
+
+        if not self._set_sql:
+            super(Connection, self).update(other, **kwargs)
+            return
+
+        expire = self._expire()
+        dumps = self._dumps
+
+        def parameters() -> Iterator[Tuple[str, int, Any]]:
+            if hasattr(other, 'items'):
+                for key, value in other.items(): # type: ignore
+                    yield key, expire, dumps(value)
             else:
-                cursor.execute(f'''
-                        INSERT INTO {self._table} (key, expire, value)
-                            VALUES (?, {_unixepoch} + ?, ?)
-                    ''',
-                    (key, self._lifespan, self._serializer.dumps(value)),
-                )
+                for key, value in other:
+                    yield key, expire, dumps(value)
+            for key, value in kwargs.items():
+                yield key, expire, dumps(value)
+
+        self._cursor.executemany(self._set_sql, parameters())
 
     def __delitem__(self, key: str) -> None:
         '''Delete an item from the table.
         '''
 
-        with closing(self._connection.cursor()) as cursor:
-            cursor.execute(f'DELETE FROM {self._table} WHERE key=?', (key,))
-            if cursor.rowcount != 1:
-                raise KeyError(key)
+        self._cursor.execute(self._del_sql, (key,))
+        if self._cursor.rowcount != 1:
+            raise KeyError(key)
 
     def clear(self) -> None:
         '''Delete all items from the table.
         '''
 
-        with closing(self._connection.cursor()) as cursor:
-            cursor.execute(f'DELETE FROM {self._table}')
+        self._connection.execute(f'DELETE FROM {self._table}')
 
     def postpone(self, key: str) -> None:
         '''Push back the expiration date of the given entry, if it exists.
         '''
-        with closing(self._connection.cursor()) as cursor:
-            cursor.execute(
-                f'UPDATE {self._table} SET expire={_unixepoch} + ? WHERE key=?',
-                (self._lifespan, key),
-            )
+        self._connection.execute(
+            f'UPDATE {self._table} SET expire=? WHERE key=?',
+            (self._expire(), key),
+        )
 
     def postpone_all(self) -> None:
         '''Push back the expiration date of all entries at once.
         '''
-        with closing(self._connection.cursor()) as cursor:
-            cursor.execute(
-                f'UPDATE {self._table} SET expire={_unixepoch} + ?',
-                (self._lifespan,),
-            )
+        self._connection.execute(
+            f'UPDATE {self._table} SET expire=?',
+            (self._expire(),),
+        )
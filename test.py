@@ -9,7 +9,7 @@ import unittest
 from datetime import timedelta
 from tempfile import TemporaryDirectory
 from pathlib import Path
-from expiringsqlitedict import ConnectionManager, Manager, Simple, Order
+from expiringsqlitedict import CompressedSerializer, ConnectionManager, Manager, Simple, Order
 import json
 import marshal
 import pickle
@@ -187,6 +187,31 @@ class TestExpiringDict(unittest.TestCase):
                     self.assertEqual(tuple(d.values()), (1337, 'spam'))
                     self.assertEqual(len(d), 2)
 
+    def test_rollback_reenter(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            with ConnectionManager(str(db_path)) as manager:
+                # Rolling back the very first transaction also rolls
+                # back the schema setup; re-entering must rebuild it.
+                with self.assertRaises(RuntimeError):
+                    with manager as d:
+                        d['foo'] = 'bar'
+                        raise RuntimeError
+
+                with manager as d:
+                    self.assertFalse(bool(d))
+                    d['foo'] = 'baz'
+
+                with self.assertRaises(RuntimeError):
+                    with manager as d:
+                        d['foo'] = 'spam'
+                        raise RuntimeError
+
+                with manager as d:
+                    self.assertEqual(d['foo'], 'baz')
+                    self.assertEqual(len(d), 1)
+
     def test_migration(self):
         with TemporaryDirectory() as temporary_directory:
             db_path = Path(temporary_directory) / 'test.db'
@@ -266,7 +291,7 @@ class TestExpiringDict(unittest.TestCase):
                 with Manager(str(db_path)) as d:
                     del d['foo']
 
-            
+
             with Manager(str(db_path)) as d:
                 d['foo'] = 'spam'
 
@@ -278,6 +303,84 @@ class TestExpiringDict(unittest.TestCase):
                 self.assertEqual(tuple(d.values()), (1337, 'spam'))
                 self.assertEqual(len(d), 2)
 
+    def test_migration_v1(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            with closing(sqlite3.connect(str(db_path))) as connection:
+                with closing(connection.cursor()) as cursor:
+                    cursor.execute('PRAGMA application_id = 1820903862')
+                    cursor.execute('PRAGMA user_version = 1')
+                    cursor.execute('''
+                        CREATE TABLE expiringsqlitedict (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+                            key TEXT UNIQUE NOT NULL,
+                            expire INTEGER NOT NULL,
+                            value BLOB NOT NULL
+                        )
+                    ''')
+                    cursor.execute('''
+                        CREATE INDEX expiringsqlitedict_expire_index
+                            ON expiringsqlitedict (expire)
+                    ''')
+                    cursor.execute('''
+                        CREATE TRIGGER expiringsqlitedict_insert_trigger
+                            AFTER INSERT ON expiringsqlitedict
+                        BEGIN
+                            DELETE FROM expiringsqlitedict
+                                WHERE expire <= strftime('%s', 'now');
+                        END
+                    ''')
+                    cursor.execute('''
+                        CREATE TRIGGER expiringsqlitedict_update_trigger
+                            AFTER UPDATE OF value ON expiringsqlitedict
+                        BEGIN
+                            DELETE FROM expiringsqlitedict
+                                WHERE expire <= strftime('%s', 'now');
+                        END
+                    ''')
+                    cursor.executemany(
+                        '''
+                            INSERT INTO expiringsqlitedict (key, expire, value)
+                            VALUES (?, strftime('%s', 'now', '+7 days'), ?)
+                        ''',
+                        (
+                            ('foo', '"bar"'),
+                            ('baz', '1337'),
+                        ),
+                    )
+                connection.commit()
+
+            with Manager(str(db_path)) as d:
+                self.assertTrue(bool(d))
+                self.assertEqual(set(d), {'foo', 'baz'})
+                self.assertEqual(set(d.items()), {('foo', 'bar'), ('baz', 1337)})
+                self.assertEqual(len(d), 2)
+                # Values written by version 1 are stored as TEXT rather
+                # than BLOB, and must still be found by membership.
+                self.assertIn('bar', d.values())
+                self.assertIn(('baz', 1337), d.items())
+
+            # The old single-column expire index must have been replaced
+            # by the covering (expire, key) index, and the triggers
+            # dropped.
+            with closing(sqlite3.connect(str(db_path))) as connection:
+                with closing(connection.cursor()) as cursor:
+                    self.assertEqual(
+                        next(cursor.execute('PRAGMA user_version'))[0],
+                        3,
+                    )
+                    index_sql = next(cursor.execute('''
+                        SELECT sql FROM sqlite_master
+                            WHERE type='index'
+                            AND name='expiringsqlitedict_expire_index'
+                    '''))[0]
+                    self.assertIn('key', index_sql)
+                    cursor.execute('''
+                        SELECT 1 FROM sqlite_master WHERE type='trigger'
+                    ''')
+                    self.assertEqual(cursor.fetchall(), [])
+
     def test_quotes(self):
         with TemporaryDirectory() as temporary_directory:
             db_path = Path(temporary_directory) / 'test.db'
@@ -402,6 +505,95 @@ class TestExpiringDict(unittest.TestCase):
             with Manager(str(db_path), serializer = marshal) as d:
                 self.assertEqual(d['foo'], {'foo': 'bar', 'baz': [2, 'two']})
 
+    def test_update(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            with Manager(str(db_path)) as d:
+                d.update({'foo': 'bar'}, baz=1337)
+                d.update((('spam', 'eggs'),))
+
+            with Manager(str(db_path)) as d:
+                self.assertEqual(
+                    tuple(d.items()),
+                    (('foo', 'bar'), ('baz', 1337), ('spam', 'eggs')),
+                )
+                d.update(foo='barbar')
+
+            with Manager(str(db_path)) as d:
+                self.assertEqual(d['foo'], 'barbar')
+                self.assertEqual(len(d), 3)
+                # A keyword named "other" must store a key, not bind the
+                # positional argument.
+                d.update(other='value')
+
+            with Manager(str(db_path)) as d:
+                self.assertEqual(d['other'], 'value')
+                self.assertEqual(len(d), 4)
+
+    def test_get_many(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            with Manager(str(db_path)) as d:
+                d['foo'] = 'bar'
+                d['baz'] = 1337
+
+            with Manager(str(db_path)) as d:
+                self.assertEqual(
+                    d.get_many(('foo', 'baz', 'missing')),
+                    {'foo': 'bar', 'baz': 1337},
+                )
+                self.assertEqual(d.get_many(()), {})
+
+    def test_view_membership(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            with Manager(str(db_path)) as d:
+                d['foo'] = 'bar'
+                d['baz'] = 1337
+
+            with Manager(str(db_path)) as d:
+                self.assertIn('bar', d.values())
+                self.assertIn(1337, d.values())
+                self.assertNotIn('spam', d.values())
+                self.assertNotIn(object(), d.values())
+
+                self.assertIn(('foo', 'bar'), d.items())
+                self.assertIn(('baz', 1337), d.items())
+                self.assertNotIn(('foo', 'spam'), d.items())
+                self.assertNotIn(('missing', 'bar'), d.items())
+                self.assertNotIn((1, 'bar'), d.items())
+                self.assertNotIn('foo', d.items())
+
+    def test_compressed(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            with Manager(str(db_path), serializer = CompressedSerializer()) as d:
+                d['foo'] = {'foo': 'bar', 'baz': [2, 'two']}
+                d['big'] = 'spam and eggs ' * 1024
+
+            with Manager(str(db_path), serializer = CompressedSerializer()) as d:
+                self.assertEqual(d['foo'], {'foo': 'bar', 'baz': [2, 'two']})
+                self.assertEqual(d['big'], 'spam and eggs ' * 1024)
+
+    def test_compressed_zdict(self):
+        with TemporaryDirectory() as temporary_directory:
+            db_path = Path(temporary_directory) / 'test.db'
+
+            serializer = CompressedSerializer(
+                zdict = b'{"foo": "bar", "baz": ',
+                min_size = 0,
+            )
+
+            with Manager(str(db_path), serializer = serializer) as d:
+                d['foo'] = {'foo': 'bar', 'baz': [2, 'two']}
+
+            with Manager(str(db_path), serializer = serializer) as d:
+                self.assertEqual(d['foo'], {'foo': 'bar', 'baz': [2, 'two']})
+
     def test_expire(self):
         with TemporaryDirectory() as temporary_directory:
             db_path = Path(temporary_directory) / 'test.db'
@@ -415,9 +607,10 @@ class TestExpiringDict(unittest.TestCase):
                 d.postpone_all()
                 d.lifespan = timedelta(weeks=1)
                 d.postpone('postponed')
-                # This triggers the actual expiry
                 d['baz'] = 1337
 
+            # The expired entry is swept when the next transaction opens
+
             with Manager(str(db_path)) as d:
                 self.assertTrue(bool(d))
                 self.assertEqual(tuple(d), ('postponed', 'baz'))